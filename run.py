@@ -1,37 +1,459 @@
 import os
-import json
+import sys
 import glob
+import multiprocessing
+import struct
+import functools
 import rasterio
+from rasterio.enums import Interleaving
+from rasterio.windows import Window
 import numpy as np
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from datetime import datetime
 from dotenv import load_dotenv
-from multiprocessing import Pool, cpu_count
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 
 # Maksimum veritabanı bağlantı sayısını belirle
 MAX_DB_CONNECTIONS = 100
 
+# Aynı dizindeki çok sayıda dosya için her açılışta dizin listelemesi yapılmaz;
+# yardımcı dosyalar (.aux.xml, .ovr) yine doğrudan kontrol edilir
+GDAL_ENV_OPTIONS = {
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'TRUE',
+    'CPL_VSIL_CURL_ALLOWED_EXTENSIONS': '.tif',
+    'VSI_CACHE': 'TRUE'
+}
+
+# Dosya işleyen süreç başına GDAL blok önbelleği (MB). Piksel düzenli dosyalar tek okumada alındığından,
+# band düzenli dosyalarda da her band kendi bloklarında tutulduğundan her blok yalnızca bir kez açılır
+GDAL_CACHEMAX_MB = 64
+
+# Tek bir COPY ile gönderilecek yaklaşık satır sayısı
+BATCH_SIZE = 100000
+
+# COPY tamponundan tek seferde okunan bayt; büyük parçalar yazma thread'inin GIL'i daha az almasını sağlar
+COPY_READ_SIZE = 1 << 20
+
+STAGE_COLUMNS = "tower_serial, file_name, band, value"
+
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+
+
+def _copy_field(data):
+    return struct.pack('>i', len(data)) + data
+
+
+class CopyRowEncoder:
+    # Satır düzeni: alan sayısı | tower_serial | file_name | band | value
+    # Direkler seri numarası uzunluğuna göre gruplanır; her grup sabit genişlikli bir structured dtype ile kodlanır.
+    # Seri numarasına bağlı alanlar bir kez hazırlanır, band başına yalnızca sabit alanlar ve değerler yazılır.
+    def __init__(self, serials):
+        serials = [str(serial).strip().encode('utf-8') for serial in serials]
+        lengths = np.fromiter((len(serial) for serial in serials), dtype=np.int64, count=len(serials))
+        self.row_count = len(serials)
+        self.groups = []
+        for length in np.unique(lengths):
+            idx = np.flatnonzero(lengths == length)
+            group_serials = np.array([serials[i] for i in idx], dtype=f'S{length}')
+            self.groups.append((int(length), idx, group_serials))
+        # Tüm seri numaraları aynı uzunluktaysa değerler fancy indexing kopyası olmadan doğrudan okunur
+        if len(self.groups) == 1:
+            length, _, group_serials = self.groups[0]
+            self.groups[0] = (length, slice(None), group_serials)
+        self._templates = {}
+
+    def _get_templates(self, constant_length):
+        templates = self._templates.get(constant_length)
+        if templates is None:
+            templates = []
+            for length, _, group_serials in self.groups:
+                rows = np.empty(len(group_serials), dtype=[
+                    ('field_count', '>i2'),
+                    ('serial_length', '>i4'),
+                    ('serial', f'S{length}'),
+                    ('constant', f'S{constant_length}'),
+                    ('value', '>f4'),
+                ])
+                rows['field_count'] = 4
+                rows['serial_length'] = length
+                rows['serial'] = group_serials
+                templates.append(rows)
+            self._templates[constant_length] = templates
+        return templates
+
+    def encode(self, file_name, band_num, values, inside=None):
+        # inside verilirse yalnızca maskede True olan direklerin satırları kodlanır
+        constant = (_copy_field(file_name.encode('utf-8'))
+                    + struct.pack('>ii', 4, band_num)
+                    + struct.pack('>i', 4))
+        chunks = []
+        for (_, idx, _), template in zip(self.groups, self._get_templates(len(constant))):
+            if inside is None:
+                rows = template.copy()
+                group_values = values[idx]
+            else:
+                keep = inside[idx]
+                rows = template[keep]
+                group_values = values[idx][keep]
+            rows['constant'] = constant
+            # float32 → big-endian dönüşümü tek C döngüsünde, Python float'a çevrilmeden yapılır
+            rows['value'] = group_values
+            chunks.append(rows)
+        return chunks
+
+
+def _wind_direction(raw, out):
+    np.multiply(raw, np.float32(0.1), out=out)
+    np.add(out, np.float32(180), out=out)
+    np.mod(out, np.float32(360), out=out)
+    return out
+
+
+def _scale_tenth(raw, out):
+    np.multiply(raw, np.float32(0.1), out=out)
+    return out
+
+
+TOWER_DTYPE = [('serial', 'O'), ('lat', 'f8'), ('lon', 'f8')]
+
+
+def get_valid_coordinates(towers):
+    towers = np.array(towers, dtype=TOWER_DTYPE)
+    lat, lon = towers['lat'], towers['lon']
+    mask = (~np.isnan(lat)) & (lat >= -90) & (lat <= 90) & (~np.isnan(lon)) & (lon >= -180) & (lon <= 180)
+    towers = towers[mask]
+    # Sıralama sunucu yerine burada, süreç ağacı başına bir kez yapılır
+    return towers[np.argsort(towers['serial'], kind='stable')]
+
+
+def pixel_indices(transform, coords):
+    inv = ~transform
+    xs, ys = coords[:, 0], coords[:, 1]
+    cols = np.floor(inv.a * xs + inv.b * ys + inv.c).astype(np.int64)
+    rows = np.floor(inv.d * xs + inv.e * ys + inv.f).astype(np.int64)
+    return rows, cols
+
+
+@functools.lru_cache(maxsize=16)
+def tower_window(transform, width, height):
+    # Kule koordinatları süreç boyunca sabit; aynı ızgaraya sahip dosyalar indeksleri ve pencereyi paylaşır.
+    # Rasterın tamamı yerine yalnızca raster içindeki direkleri kapsayan pencere okunur
+    rows, cols = pixel_indices(transform, _tower_coords)
+    inside = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+    if not inside.any():
+        return None, None, None, inside
+    row_off, col_off = int(rows[inside].min()), int(cols[inside].min())
+    window = Window(col_off, row_off,
+                    int(cols[inside].max()) - col_off + 1,
+                    int(rows[inside].max()) - row_off + 1)
+    # Raster dışındaki direkler pencere içinde geçerli bir piksele yönlendirilir; kodlanırken atılırlar
+    window_rows = np.where(inside, rows - row_off, 0)
+    window_cols = np.where(inside, cols - col_off, 0)
+    return window, window_rows, window_cols, None if inside.all() else inside
+
+
+def iter_band_windows(src, band_count, window):
+    # Piksel düzeninde (çok bandlı GeoTIFF varsayılanı) her blok tüm bandların değerlerini birlikte taşır;
+    # bandlar ayrı ayrı okunursa aynı bloklar her band için yeniden açılır. Bu durumda bandlar tek okumada alınır
+    if band_count and src.interleaving == Interleaving.pixel:
+        yield from src.read(list(range(1, band_count + 1)), window=window)
+        return
+    # rasterio veri kümeleri thread-safe olmadığından okumalar tek bir thread'de sırayla yapılır;
+    # sonraki bandın okunması mevcut bandın işlenmesiyle örtüşür
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        future = reader.submit(src.read, 1, window=window) if band_count else None
+        for band_num in range(1, band_count + 1):
+            band_data = future.result()
+            if band_num < band_count:
+                future = reader.submit(src.read, band_num + 1, window=window)
+            yield band_data
+
+
+class CopyPayloadStream:
+    # COPY verisi tek bir tampona birleştirilmez; kodlanmış band dizilerinden parça parça okunur.
+    # Böylece her batch için baştan büyüyen yeni bir tampon ayrılmaz
+    def __init__(self, payloads):
+        self._parts = [np.frombuffer(PGCOPY_HEADER, dtype=np.uint8)]
+        self._parts.extend(payload.view(np.uint8) for payload in payloads)
+        self._parts.append(np.frombuffer(PGCOPY_TRAILER, dtype=np.uint8))
+        self._part = 0
+        self._offset = 0
+
+    def read(self, size=-1):
+        chunks = []
+        while self._part < len(self._parts) and size != 0:
+            part = self._parts[self._part]
+            end = len(part) if size < 0 else min(len(part), self._offset + size)
+            chunks.append(part[self._offset:end])
+            if size > 0:
+                size -= end - self._offset
+            if end == len(part):
+                self._part += 1
+                self._offset = 0
+            else:
+                self._offset = end
+        return b''.join(chunks)
+
+
+def copy_to_stage(cur, stage_table, payloads):
+    cur.copy_expert(f"COPY {stage_table} ({STAGE_COLUMNS}) FROM STDIN WITH (FORMAT BINARY)",
+                    CopyPayloadStream(payloads), size=COPY_READ_SIZE)
+
+
+DATA_PROCEDURES = {
+    'wind_direction': 'process_wind_direction_data',
+    'wind_speed': 'process_wind_speed_data',
+    'wind_gust': 'process_wind_gust_data',
+    'ice_mass': 'process_ice_mass_data',
+    'ice_thickness': 'process_ice_thickness_data'
+}
+
+VALUE_CALCULATORS = {
+    'wind_direction': _wind_direction,
+    'wind_speed': _scale_tenth,
+    'wind_gust': _scale_tenth,
+    'ice_mass': _scale_tenth,
+    'ice_thickness': _scale_tenth
+}
+
+# Ana süreçte bir kez hazırlanıp alt süreçlerle paylaşılan direk verisi.
+# _tower_coords (N, 2) boyutlu [lon, lat] dizisidir; spawn kullanılırken paylaşımlı bellekte tutulur
+# ve alt süreçlere yalnızca _tower_coords_ref (bellek adı, boyut) gönderilir
+_tower_coords = None
+_tower_coords_ref = None
+_tower_coords_shm = None
+_row_encoder = None
+
+# Dosya işleyen alt süreçlerdeki bağlantı havuzu
+_connection_pool = None
+
+
+def get_db_params():
+    return {
+        'dbname': os.getenv('DB_NAME'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'host': os.getenv('DB_HOST'),
+        'port': os.getenv('DB_PORT')
+    }
+
+
+def max_file_workers_per_type():
+    # Her veri tipi kendi havuzunu açtığından çekirdekler ve bağlantılar veri tipleri arasında paylaştırılır
+    return max(1, min(multiprocessing.cpu_count() // len(DATA_PROCEDURES),
+                      MAX_DB_CONNECTIONS // len(DATA_PROCEDURES)))
+
+
+def count_tiff_files(pattern):
+    geoserver_dir = os.getenv('GEOSERVER_DIR')
+    if not geoserver_dir or not pattern:
+        return 0
+    return len(glob.glob(os.path.join(geoserver_dir, pattern)))
+
+
+def configure_gdal(file_workers):
+    # Ortam değişkenleri süreç genelinde geçerlidir; ana süreçte ayarlanır ve tüm alt süreçlere aktarılır.
+    # Çekirdekler gerçekten çalışacak dosya süreçleri arasında paylaştırılır. Her dosya süreci bandları işleyen
+    # ana thread ve COPY yazma thread'i ile zaten iki çekirdeği meşgul ettiğinden bunlar GDAL payından düşülür;
+    # ortamda zaten tanımlı değerler korunur
+    cores_per_worker = multiprocessing.cpu_count() // max(1, file_workers)
+    os.environ.setdefault('GDAL_NUM_THREADS', str(max(1, cores_per_worker - 2)))
+    os.environ.setdefault('GDAL_CACHEMAX', str(GDAL_CACHEMAX_MB))
+    for key, value in GDAL_ENV_OPTIONS.items():
+        os.environ.setdefault(key, value)
+
+
+def get_mp_context():
+    # Linux'ta fork ile direk verisi alt süreçlere kopyalanmadan (copy-on-write) geçer.
+    # macOS'ta fork güvenli olmadığından diğer platformlar gibi spawn kullanılır
+    if sys.platform.startswith('linux'):
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+def share_tower_coords():
+    # spawn ile başlayan süreçler koordinatları paylaşımlı bellekten okur; dizi her sürece ayrıca gönderilmez
+    global _tower_coords_ref
+    shm = SharedMemory(create=True, size=_tower_coords.nbytes)
+    np.ndarray(_tower_coords.shape, dtype=_tower_coords.dtype, buffer=shm.buf)[:] = _tower_coords
+    _tower_coords_ref = (shm.name, _tower_coords.shape)
+    return shm
+
+
+def _attach_tower_coords(tower_coords_ref):
+    global _tower_coords, _tower_coords_ref, _tower_coords_shm
+    _tower_coords_ref = tower_coords_ref
+    # fork ile başlayan süreçler koordinatları ana süreçten devralır
+    if tower_coords_ref is None:
+        return
+    name, shape = tower_coords_ref
+    _tower_coords_shm = SharedMemory(name=name)
+    _tower_coords = np.ndarray(shape, dtype=np.float64, buffer=_tower_coords_shm.buf)
+
+
+def load_towers(db_params):
+    global _tower_coords, _row_encoder
+    conn = psycopg2.connect(**db_params)
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT tower_serial, mid_latitude, mid_longitude 
+            FROM teias_towers 
+            WHERE mid_latitude IS NOT NULL 
+            AND mid_longitude IS NOT NULL
+        """)
+        towers = cur.fetchall()
+        cur.close()
+    finally:
+        conn.close()
+
+    valid_towers = get_valid_coordinates(towers)
+    _tower_coords = np.column_stack((valid_towers['lon'], valid_towers['lat']))
+    _row_encoder = CopyRowEncoder(valid_towers['serial'])
+    print(f"   📍 Toplam direk: {len(towers)}, Geçerli koordinat: {len(valid_towers)}")
+
+
+def _init_tower_data(tower_coords_ref, row_encoder):
+    global _row_encoder
+    _attach_tower_coords(tower_coords_ref)
+    _row_encoder = row_encoder
+
+
+def _init_tiff_worker(db_params, tower_coords_ref, row_encoder):
+    global _connection_pool
+    _init_tower_data(tower_coords_ref, row_encoder)
+    # Bağlantılar süreç boyunca açık kalır; her dosya için yeniden bağlanılmaz
+    _connection_pool = ThreadedConnectionPool(1, 4, **db_params)
+
+
+def stage_table_names(data_type):
+    # Band zamanı her satırda tekrarlanmaz; band başına bir kez ayrı tabloya yazılır
+    return f"teias_stage_{data_type}", f"teias_stage_{data_type}_bands"
+
+
+def create_stage_tables(cur, data_type):
+    # Staging tabloları bağlantıya özel geçici tablolardır; eşzamanlı dosyalar aynı tabloyu paylaşmaz ve
+    # taranacak başka dosya satırı kalmaz. Aynı oturumda çalışan prosedür tabloları okur, satırlar commit ile silinir
+    stage_table, band_table = stage_table_names(data_type)
+    cur.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {stage_table} (
+            tower_serial text,
+            file_name text,
+            band int,
+            value real
+        ) ON COMMIT DELETE ROWS
+    """)
+    cur.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {band_table} (
+            file_name text,
+            band int,
+            band_time text
+        ) ON COMMIT DELETE ROWS
+    """)
+
+
+def process_tiff_file(data_type, tiff_path):
+    print(f"\n   📥 {data_type.upper()} verisi işleniyor: {tiff_path}")
+
+    conn = None
+    try:
+        conn = _connection_pool.getconn()
+        conn.autocommit = False
+        cur = conn.cursor()
+
+        file_name = os.path.splitext(os.path.basename(tiff_path))[0]
+        stage_table, band_table = stage_table_names(data_type)
+
+        # Dosya tek bir transaction içinde yüklenir. Yükleme tekrar çalıştırılabilir olduğundan
+        # commit sırasında WAL fsync beklenmez
+        cur.execute("SET LOCAL synchronous_commit = off")
+        create_stage_tables(cur, data_type)
+
+        with rasterio.Env(**GDAL_ENV_OPTIONS), rasterio.open(tiff_path) as src:
+            band_count = min(src.count, 6)
+            # Band açıklamaları bir kez hazırlanır; okuma thread'i çalışırken veri kümesine ana thread'den erişilmez
+            band_descriptions = [str(description).strip() for description in src.descriptions[:band_count]]
+            base_time = datetime.strptime(band_descriptions[0], "%Y-%m-%d_%H")
+            print(f"   🎛 Band sayısı: {band_count}, Başlangıç zamanı: {base_time}")
+
+            window, window_rows, window_cols, inside = tower_window(src.transform, src.width, src.height)
+            if window is None:
+                raise ValueError("Raster sınırları içinde direk bulunamadı")
+            record_count = _row_encoder.row_count if inside is None else int(inside.sum())
+            if record_count < _row_encoder.row_count:
+                print(f"   ⚠️ Raster sınırları dışında kalan {_row_encoder.row_count - record_count:,} direk atlandı")
+            calculated_values = np.empty(_row_encoder.row_count, dtype=np.float32)
+            # Batch sınırları band sınırlarına denk gelir; her COPY tam sayıda band taşır
+            bands_per_batch = max(1, BATCH_SIZE // max(1, _row_encoder.row_count))
+            pending_payloads = []
+            pending_bands = 0
+            total_records = 0
+
+            execute_values(
+                cur,
+                f"INSERT INTO {band_table} (file_name, band, band_time) VALUES %s",
+                [(file_name, band_index + 1, band_description) for band_index, band_description in enumerate(band_descriptions)],
+                page_size=1000
+            )
+
+            # Okuma, hesaplama ve veritabanı yazımı örtüşür: bir batch yazılırken sonraki bandlar okunup kodlanır.
+            # Aynı anda en fazla bir yazım beklemede tutulur; bağlantıya bu sürede yalnızca yazma thread'i erişir
+            print("   🛠 Band verileri işleniyor...")
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending_write = None
+                for band_index, band_data in enumerate(iter_band_windows(src, band_count, window)):
+                    band_num = band_index + 1
+                    print(f"      ▶️ Band {band_num}/{band_count} işleniyor...")
+
+                    VALUE_CALCULATORS[data_type](band_data[window_rows, window_cols], calculated_values)
+
+                    pending_payloads.extend(_row_encoder.encode(file_name, band_num, calculated_values, inside))
+                    pending_bands += 1
+                    total_records += record_count
+
+                    if pending_bands == bands_per_batch or band_num == band_count:
+                        if pending_write is not None:
+                            pending_write.result()
+                        print(f"         💾 Batch yazılıyor... (Toplam: {total_records:,} kayıt)")
+                        pending_write = writer.submit(copy_to_stage, cur, stage_table, pending_payloads)
+                        pending_payloads = []
+                        pending_bands = 0
+
+                if pending_write is not None:
+                    pending_write.result()
+
+            # Tek parametreli prosedürler sql/stage_procedures.sql içinde tanımlıdır; base_time staging tablosundaki
+            # 1. bandın zamanından alınır ve mevcut (file_name, base_time, json) prosedürüne aktarılır
+            procedure = DATA_PROCEDURES.get(data_type)
+            if procedure:
+                print(f"         🔀 Staging tablosu birleştiriliyor: {stage_table} → {procedure}({file_name})")
+                cur.execute(f"CALL {procedure}(%s);", (file_name,))
+            conn.commit()
+
+            print(f"   ✅ {data_type.upper()} işlemi tamamlandı. Toplam {total_records:,} kayıt işlendi.")
+            cur.close()
+
+    except Exception as e:
+        if conn is not None and not conn.closed:
+            # Bağlantı kopmuşsa rollback da hata verebilir; asıl hata gizlenmeden bağlantı havuza döner
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+        print(f"   ❌ {data_type.upper()} işlemi başarısız: {str(e)}")
+
+    finally:
+        if conn is not None:
+            _connection_pool.putconn(conn)
+
+
 class IndependentLegacyDataLoader:
     def __init__(self, db_connection_params):
-        self.conn = psycopg2.connect(**db_connection_params)
-        self.conn.autocommit = False
-        self.cur = self.conn.cursor()
-
-        self.data_procedures = {
-            'wind_direction': 'process_wind_direction_data',
-            'wind_speed': 'process_wind_speed_data',
-            'wind_gust': 'process_wind_gust_data',
-            'ice_mass': 'process_ice_mass_data',
-            'ice_thickness': 'process_ice_thickness_data'
-        }
-
-        self.value_calculators = {
-            'wind_direction': lambda x: np.mod((x * 0.1 + 180), 360).astype(np.float32),
-            'wind_speed': lambda x: (x * 0.1).astype(np.float32),
-            'wind_gust': lambda x: (x * 0.1).astype(np.float32),
-            'ice_mass': lambda x: (x * 0.1).astype(np.float32),
-            'ice_thickness': lambda x: (x * 0.1).astype(np.float32)
-        }
+        self.db_connection_params = db_connection_params
 
     def load_legacy_data(self, data_type, pattern):
         try:
@@ -45,102 +467,22 @@ class IndependentLegacyDataLoader:
                 return
 
             print(f"   📌 Bulunan dosyalar: {tiff_files}")
-            for tiff_file in sorted(tiff_files):
-                self.process_tiff_file(data_type, tiff_file)
-
-        except Exception as e:
-            print(f"   ❌ {data_type.upper()} yüklenirken hata oluştu: {str(e)}")
 
-    def process_tiff_file(self, data_type, tiff_path):
-        print(f"\n   📥 {data_type.upper()} verisi işleniyor: {tiff_path}")
-
-        try:
-            conn = psycopg2.connect(
-                dbname=os.getenv('DB_NAME'),
-                user=os.getenv('DB_USER'),
-                password=os.getenv('DB_PASSWORD'),
-                host=os.getenv('DB_HOST'),
-                port=os.getenv('DB_PORT')
-            )
-            conn.autocommit = False
-            cur = conn.cursor()
-
-            file_name = os.path.splitext(os.path.basename(tiff_path))[0]
-            
-            cur.execute("""
-                SELECT tower_serial, mid_latitude, mid_longitude 
-                FROM teias_towers 
-                WHERE mid_latitude IS NOT NULL 
-                AND mid_longitude IS NOT NULL
-                ORDER BY tower_serial
-            """)
-            towers = cur.fetchall()
-
-            valid_poles = [pole for pole in towers if -90 <= float(pole[1]) <= 90 and -180 <= float(pole[2]) <= 180]
-            print(f"   📍 Toplam direk: {len(towers)}, Geçerli koordinat: {len(valid_poles)}")
-
-            with rasterio.open(tiff_path) as src:
-                base_time = datetime.strptime(str(src.descriptions[0]), "%Y-%m-%d_%H")
-                band_count = min(src.count, 6)
-                print(f"   🎛 Band sayısı: {band_count}, Başlangıç zamanı: {base_time}")
-
-                rows, cols = zip(*[src.index(float(pole[2]), float(pole[1])) for pole in valid_poles])
-                all_band_data = src.read()
-                batch_size = 100000
-                batch_data = []
-                total_records = 0
-
-                print("   🛠 Band verileri işleniyor...")
-                for band_index in range(band_count):
-                    band_num = band_index + 1
-                    print(f"      ▶️ Band {band_num}/{band_count} işleniyor...")
-
-                    band_description = str(src.descriptions[band_index]).strip()
-                    calculated_values = self.value_calculators[data_type](all_band_data[band_index][rows, cols])
-
-                    for idx, pole in enumerate(valid_poles):
-                        batch_data.append({
-                            'tower_serial': str(pole[0]).strip(),
-                            'file_name': file_name,
-                            'band': int(band_num),
-                            'band_description': band_description,
-                            'forecast_time': band_description,
-                            'value': float(calculated_values[idx])
-                        })
-                        total_records += 1
-
-                        if len(batch_data) >= batch_size:
-                            print(f"         💾 Batch yazılıyor... (Toplam: {total_records:,} kayıt)")
-                            procedure = self.data_procedures.get(data_type)
-                            if procedure:
-                                cur.execute(f"CALL {procedure}(%s, %s, %s);", (file_name, base_time, json.dumps(batch_data)))
-                                conn.commit()
-                            batch_data = []
-
-                if batch_data:
-                    print(f"         📌 Son batch yazılıyor... (Toplam: {total_records:,} kayıt)")
-                    procedure = self.data_procedures.get(data_type)
-                    if procedure:
-                        cur.execute(f"CALL {procedure}(%s, %s, %s);", (file_name, base_time, json.dumps(batch_data)))
-                        conn.commit()
-
-                print(f"   ✅ {data_type.upper()} işlemi tamamlandı. Toplam {total_records:,} kayıt işlendi.")
-                cur.close()
-                conn.close()
+            max_workers = min(len(tiff_files), max_file_workers_per_type())
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=get_mp_context(),
+                                     initializer=_init_tiff_worker,
+                                     initargs=(self.db_connection_params, _tower_coords_ref, _row_encoder)) as executor:
+                futures = [executor.submit(process_tiff_file, data_type, tiff_file) for tiff_file in sorted(tiff_files)]
+                for future in futures:
+                    future.result()
 
         except Exception as e:
-            print(f"   ❌ {data_type.upper()} işlemi başarısız: {str(e)}")
+            print(f"   ❌ {data_type.upper()} yüklenirken hata oluştu: {str(e)}")
 
 def process_data_type(data_config):
     load_dotenv()
-    db_params = {
-        'dbname': os.getenv('DB_NAME'),
-        'user': os.getenv('DB_USER'),
-        'password': os.getenv('DB_PASSWORD'),
-        'host': os.getenv('DB_HOST'),
-        'port': os.getenv('DB_PORT')
-    }
-    loader = IndependentLegacyDataLoader(db_params)
+    loader = IndependentLegacyDataLoader(get_db_params())
     data_type, pattern = data_config
     loader.load_legacy_data(data_type, pattern)
 
@@ -155,13 +497,34 @@ def main():
     ]
 
     # Maksimum çekirdekleri ve bağlantı sınırını kullanarak işlem sayısını belirle
-    num_processes = min(len(data_configs), cpu_count(), MAX_DB_CONNECTIONS)
+    num_processes = min(len(data_configs), multiprocessing.cpu_count(), MAX_DB_CONNECTIONS)
 
     print("\n=== ✅ Veri İşlemleri Başlıyor ✅ ===")
-    
-    # Paralel işleme başlat
-    with Pool(processes=num_processes) as pool:
-        pool.map(process_data_type, data_configs)
+
+    # Her veri tipi dosya sayısı kadar, en fazla max_file_workers_per_type() dosya süreci açar
+    file_workers = sum(min(count_tiff_files(pattern), max_file_workers_per_type()) for _, pattern in data_configs)
+    configure_gdal(file_workers)
+
+    # Direkler tüm veri tipleri için bir kez çekilir
+    load_towers(get_db_params())
+    # Geçerli direk yoksa her dosya aynı hatayla başarısız olur; spawn ile boş paylaşımlı bellek de oluşturulamaz
+    if _row_encoder.row_count == 0:
+        print("   ❌ Geçerli koordinata sahip direk bulunamadı.")
+        return
+    mp_context = get_mp_context()
+    coords_shm = share_tower_coords() if mp_context.get_start_method() == 'spawn' else None
+
+    try:
+        # Paralel işleme başlat; dosya havuzlarını açabilmeleri için işçiler daemon olmayan süreçlerdir
+        with ProcessPoolExecutor(max_workers=num_processes,
+                                 mp_context=mp_context,
+                                 initializer=_init_tower_data,
+                                 initargs=(_tower_coords_ref, _row_encoder)) as executor:
+            list(executor.map(process_data_type, data_configs))
+    finally:
+        if coords_shm is not None:
+            coords_shm.close()
+            coords_shm.unlink()
 
     print("\n=== ✅ Tüm Veri İşlemleri Tamamlandı ✅ ===")
 
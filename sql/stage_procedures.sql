@@ -0,0 +1,57 @@
+-- run.py her dosyayı bağlantıya özel geçici staging tablolarına COPY ile yükler ve ardından
+-- aynı oturumda CALL process_<tip>_data(file_name) çağırır:
+--
+--   teias_stage_<tip>        (tower_serial text, file_name text, band int, value real)
+--   teias_stage_<tip>_bands  (file_name text, band int, band_time text)
+--
+-- Tablolar run.py tarafından CREATE TEMP TABLE ... ON COMMIT DELETE ROWS ile oluşturulur; burada
+-- oluşturulmaz. Aşağıdaki tek parametreli prosedürler mevcut process_<tip>_data(text, timestamp, json)
+-- prosedürlerinin önüne eklenir: staging satırlarını eski JSON biçimine çevirip eski prosedürü çağırırlar.
+-- Başlangıç zamanı (base_time) eskiden olduğu gibi 1. bandın açıklamasıdır ('YYYY-MM-DD_HH').
+--
+-- Kurulum: psql -d <veritabanı> -f sql/stage_procedures.sql
+
+DO $do$
+DECLARE
+    data_type text;
+BEGIN
+    FOREACH data_type IN ARRAY ARRAY['wind_direction', 'wind_speed', 'wind_gust', 'ice_mass', 'ice_thickness'] LOOP
+        EXECUTE format($proc$
+            CREATE OR REPLACE PROCEDURE %1$I(p_file_name text)
+            LANGUAGE plpgsql AS $body$
+            DECLARE
+                v_base_time timestamp;
+                v_data json;
+            BEGIN
+                SELECT to_timestamp(band_time, 'YYYY-MM-DD_HH24')::timestamp
+                INTO v_base_time
+                FROM %2$I
+                WHERE file_name = p_file_name AND band = 1;
+
+                IF v_base_time IS NULL THEN
+                    RAISE EXCEPTION '%% için 1. band zamanı bulunamadı', p_file_name;
+                END IF;
+
+                SELECT json_agg(json_build_object(
+                           'tower_serial', s.tower_serial,
+                           'file_name', s.file_name,
+                           'band', s.band,
+                           'band_description', b.band_time,
+                           'forecast_time', b.band_time,
+                           'value', s.value
+                       ) ORDER BY s.band, s.tower_serial)
+                INTO v_data
+                FROM %3$I s
+                JOIN %2$I b ON b.file_name = s.file_name AND b.band = s.band
+                WHERE s.file_name = p_file_name;
+
+                CALL %1$I(p_file_name, v_base_time, v_data);
+            END
+            $body$
+        $proc$,
+            'process_' || data_type || '_data',
+            'teias_stage_' || data_type || '_bands',
+            'teias_stage_' || data_type);
+    END LOOP;
+END
+$do$;